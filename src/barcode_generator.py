@@ -1,20 +1,142 @@
 """Barcode generation module."""
-import barcode
-from barcode.writer import ImageWriter
+from functools import cache, lru_cache
 from PIL import Image
-from typing import Optional, Tuple
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
 import sys
+import click
+
+from .batch_render import render_unique_map
+
+
+# Maps python-barcode module characters to 8-bit pixels: bars black, spaces white
+_MODULE_PIXELS = bytes.maketrans(b'01G', b'\xff\x00\x00')
+
+# EAN-13 digit patterns (7 modules per digit): L and G code sets for the left
+# half, R for the right half
+EAN13_L_PATTERNS = ('0001101', '0011001', '0010011', '0111101', '0100011',
+                    '0110001', '0101111', '0111011', '0110111', '0001011')
+EAN13_G_PATTERNS = ('0100111', '0110011', '0011011', '0100001', '0011101',
+                    '0111001', '0000101', '0010001', '0001001', '0010111')
+EAN13_R_PATTERNS = ('1110010', '1100110', '1101100', '1000010', '1011100',
+                    '1001110', '1010000', '1000100', '1001000', '1110100')
+# L/G selection for the six left digits, indexed by the (implicit) first digit
+EAN13_PARITY = ('LLLLLL', 'LLGLGG', 'LLGGLG', 'LLGGGL', 'LGLLGG',
+                'LGGLLG', 'LGGGLL', 'LGLGLG', 'LGLGGL', 'LGGLGL')
+EAN13_EDGE = '101'
+EAN13_MIDDLE = '01010'
+# Per (first digit, position) lookup table for the left half
+_EAN13_LEFT = tuple(
+    tuple({'L': EAN13_L_PATTERNS, 'G': EAN13_G_PATTERNS}[parity] for parity in parities)
+    for parities in EAN13_PARITY
+)
+
+# Code 39 character patterns (12 modules each), in checksum value order
+CODE39_CHARS = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ-. $/+%'
+CODE39_PATTERNS = (
+    '101000111011101', '111010001010111', '101110001010111', '111011100010101',
+    '101000111010111', '111010001110101', '101110001110101', '101000101110111',
+    '111010001011101', '101110001011101', '111010100010111', '101110100010111',
+    '111011101000101', '101011100010111', '111010111000101', '101110111000101',
+    '101010001110111', '111010100011101', '101110100011101', '101011100011101',
+    '111010101000111', '101110101000111', '111011101010001', '101011101000111',
+    '111010111010001', '101110111010001', '101010111000111', '111010101110001',
+    '101110101110001', '101011101110001', '111000101010111', '100011101010111',
+    '111000111010101', '100010111010111', '111000101110101', '100011101110101',
+    '100010101110111', '111000101011101', '100011101011101', '100010001000101',
+    '100010001010001', '100010100010001', '101000100010001',
+)
+CODE39_EDGE = '100010111011101'  # Start/stop character (*)
+_CODE39_VALUES = {char: value for value, char in enumerate(CODE39_CHARS)}
+
+
+# Approximate barcode length per symbology for get_width(), as
+# (modules per unit, characters per unit, fixed start/stop modules)
+_WIDTH_MODULES = {
+    'code128': (11, 1, 11),  # Roughly 11 modules per character + start/stop
+    'code39': (13, 1, 13),  # Roughly 13 modules per character + start/stop
+    'ean13': (0, 1, 95),  # Fixed 95 modules
+    'i2of5': (7, 2, 7),  # Roughly 7 modules per 2 digits + start/stop
+    'itf': (7, 2, 7),
+}
+
+
+def _is_ascii_digits(data: str) -> bool:
+    """True if data is non-empty and only contains the ASCII digits 0-9.
+    
+    str.isdigit() alone also accepts other Unicode digits (e.g. '²', '٣'),
+    which numeric symbologies cannot encode. str.isascii() is O(1) for
+    CPython strings, so the combined check is a single C-level scan.
+    """
+    return data.isascii() and data.isdigit()
+
+
+@lru_cache(maxsize=256)
+def _target_width_pixels(length: int, dpi: int) -> int:
+    """Maximum rendered barcode width in pixels for data of the given length."""
+    # Calculate target width in mm (we want the barcode to fit reasonably)
+    # For a 12-digit code, target about 40-50mm width
+    target_width_mm = max(30, min(60, length * 3.5))  # Rough estimate: 3.5mm per digit
+    return int((target_width_mm / 25.4) * dpi)
+
+
+def _build_ean13(data: str) -> str:
+    """Build the 95-module EAN-13 pattern from 12 or 13 digits.
+    
+    The check digit is always recomputed from the first 12 digits.
+    """
+    digits = [int(c) for c in data[:12]]
+    checksum = (10 - (sum(digits[-1::-2]) * 3 + sum(digits[-2::-2])) % 10) % 10
+    digits.append(checksum)
+    
+    left = _EAN13_LEFT[digits[0]]
+    return ''.join((
+        EAN13_EDGE,
+        *(left[i][d] for i, d in enumerate(digits[1:7])),
+        EAN13_MIDDLE,
+        *(EAN13_R_PATTERNS[d] for d in digits[7:]),
+        EAN13_EDGE,
+    ))
+
+
+def _build_code39(data: str) -> str:
+    """Build the Code 39 pattern for uppercase data, appending the mod-43 check character."""
+    values = [_CODE39_VALUES[c] for c in data]
+    values.append(sum(values) % 43)
+    return '0'.join((CODE39_EDGE, *(CODE39_PATTERNS[v] for v in values), CODE39_EDGE))
+
+
+def _build_code128(data: str) -> str:
+    """Build the Code 128 pattern using python-barcode's encoder."""
+    return BarcodeGenerator._get_class('code128')(data).build()[0]
+
+
+def _build_itf(data: str) -> str:
+    """Build the Interleaved 2 of 5 pattern using python-barcode's encoder."""
+    return BarcodeGenerator._get_class('itf')(data).build()[0]
 
 
 class BarcodeGenerator:
     """Generates barcodes as PIL Images."""
     
+    # Deletes every valid Code 39 character; anything left over is invalid
+    _CODE39_DEL_TABLE = str.maketrans('', '', CODE39_CHARS)
+    
+    # Supported symbologies and their python-barcode names
     SUPPORTED_SYMBOLOGIES = {
-        'code128': barcode.get_barcode_class('code128'),
-        'code39': barcode.get_barcode_class('code39'),
-        'ean13': barcode.get_barcode_class('ean13'),
-        'i2of5': barcode.get_barcode_class('itf'),  # Interleaved 2 of 5 is 'itf' in python-barcode
-        'itf': barcode.get_barcode_class('itf')  # Also support direct 'itf' name
+        'code128': 'code128',
+        'code39': 'code39',
+        'ean13': 'ean13',
+        'i2of5': 'itf',  # Interleaved 2 of 5 is 'itf' in python-barcode
+        'itf': 'itf'  # Also support direct 'itf' name
+    }
+    
+    # Module-pattern builder for each symbology ("1" = bar, "0" = space)
+    _MODULE_BUILDERS = {
+        'code128': _build_code128,
+        'code39': _build_code39,
+        'ean13': _build_ean13,
+        'i2of5': _build_itf,
+        'itf': _build_itf,
     }
     
     def __init__(self, symbology: str, height_mm: float, width_factor: float, 
@@ -37,8 +159,6 @@ class BarcodeGenerator:
         if self.symbology_name not in self.SUPPORTED_SYMBOLOGIES:
             raise ValueError(f"Unsupported symbology: {symbology}")
         
-        self.barcode_class = self.SUPPORTED_SYMBOLOGIES[self.symbology_name]
-        
         # Convert mm to pixels
         self.height_pixels = int((height_mm / 25.4) * dpi)
         self.quiet_zone_pixels = int((quiet_zone_mm / 25.4) * dpi)
@@ -49,6 +169,27 @@ class BarcodeGenerator:
         # At 300 DPI, 1 pixel = 0.084mm, so module_width of 2 = 0.168mm per module
         # This creates readable barcodes without being too large
         self.module_width_pixels = max(1, min(int(width_factor), 3))
+        
+        # Width estimate constants for get_width()
+        self._width_modules = _WIDTH_MODULES.get(self.symbology_name, (10, 1, 0))
+        self._module_width_mm = (width_factor / 25.4) * (300 / dpi)  # Rough conversion
+        self._quiet_zones_mm = 2 * quiet_zone_mm
+        
+        # Per-instance constants, resolved once rather than on every call
+        self._build_modules = self._MODULE_BUILDERS[self.symbology_name]
+        self._render_options = (self.height_pixels, self.module_width_pixels, self.quiet_zone_pixels, dpi)
+    
+    @staticmethod
+    @cache
+    def _get_class(symbology: str) -> type:
+        """Look up the python-barcode class, importing the library on first use."""
+        import barcode
+        return barcode.get_barcode_class(BarcodeGenerator.SUPPORTED_SYMBOLOGIES[symbology])
+    
+    @property
+    def barcode_class(self) -> type:
+        """python-barcode class for this generator's symbology."""
+        return self._get_class(self.symbology_name)
     
     def validate(self, data: str) -> Tuple[bool, Optional[str]]:
         """Validate data for the chosen symbology.
@@ -59,28 +200,65 @@ class BarcodeGenerator:
         if self.symbology_name == 'code39':
             # Code 39: A-Z, 0-9, and symbols: - . $ / + % SPACE
             # Lowercase letters are auto-converted
-            valid_chars = set('ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789-.$/+% ')
-            if not all(c.upper() in valid_chars for c in data):
-                return False, f"Code 39 only supports: A-Z, 0-9, and symbols: - . $ / + % SPACE"
+            upper = data.upper()
+            if len(upper) == len(data):
+                invalid = upper.translate(self._CODE39_DEL_TABLE)
+            else:
+                # Some characters (e.g. 'ß') uppercase to several letters;
+                # those are invalid themselves, so check one at a time
+                invalid = ''.join(c for c in data
+                                  if len(c.upper()) != 1 or c.upper().translate(self._CODE39_DEL_TABLE))
+            if invalid:
+                return False, (f"Code 39 only supports: A-Z, 0-9, and symbols: - . $ / + % SPACE "
+                               f"(invalid: {''.join(sorted(set(invalid)))})")
         
         elif self.symbology_name == 'ean13':
             # EAN-13: Numeric only, exactly 12 or 13 digits
-            if not data.isdigit():
+            length = len(data)
+            if not _is_ascii_digits(data):
                 return False, "EAN-13 requires numeric only (0-9)"
-            if len(data) not in [12, 13]:
-                return False, f"EAN-13 requires exactly 12 or 13 digits, got {len(data)}"
+            if length != 12 and length != 13:
+                return False, f"EAN-13 requires exactly 12 or 13 digits, got {length}"
         
         elif self.symbology_name in ['i2of5', 'itf']:
             # Interleaved 2 of 5: Numeric only, even number of digits
-            if not data.isdigit():
+            length = len(data)
+            if not _is_ascii_digits(data):
                 return False, "Interleaved 2 of 5 requires numeric only (0-9)"
-            if len(data) % 2 != 0:
-                return False, f"Interleaved 2 of 5 requires even number of digits, got {len(data)}"
+            if length % 2 != 0:
+                return False, f"Interleaved 2 of 5 requires even number of digits, got {length}"
         
         # Code 128 supports full ASCII, no validation needed
         
         return True, None
     
+    def validate_all(self, ids: Sequence[str], values: Sequence[str]) -> Tuple[List[bool], List[str]]:
+        """Validate every value, collecting a skip warning for each invalid one.
+        
+        Returns:
+            Tuple of (per-value validity flags, warning messages)
+        """
+        valid = []
+        warnings = []
+        for entry_id, value in zip(ids, values):
+            is_valid, error_msg = self.validate(value)
+            if not is_valid:
+                warnings.append(f"Warning: Skipping {entry_id}: {error_msg}")
+            valid.append(is_valid)
+        return valid, warnings
+    
+    def report_invalid(self, ids: Sequence[str], values: Sequence[str]) -> List[bool]:
+        """Validate every value and echo a skip warning for each invalid one.
+        
+        Returns:
+            Per-value validity flags
+        """
+        valid, warnings = self.validate_all(ids, values)
+        if warnings:
+            # One write for all warnings rather than a stderr flush per entry
+            click.echo('\n'.join(warnings), err=True)
+        return valid
+    
     def normalize(self, data: str) -> str:
         """Normalize data for symbology (e.g., uppercase for Code 39)."""
         if self.symbology_name == 'code39':
@@ -90,6 +268,11 @@ class BarcodeGenerator:
     def generate(self, data: str) -> Optional[Image.Image]:
         """Generate barcode image from data.
         
+        Repeated values are served from a shared render cache, so callers
+        must treat the returned image as read-only. The image's
+        ``info['dpi']`` gives the horizontal and vertical resolution it is
+        meant to be printed at.
+        
         Args:
             data: Data to encode in barcode
             
@@ -100,49 +283,52 @@ class BarcodeGenerator:
             # Normalize data
             normalized_data = self.normalize(data)
             
-            # Create barcode
-            barcode_instance = self.barcode_class(normalized_data, writer=ImageWriter())
-            
-            # Generate image with custom settings
-            # module_width should be in pixels, not the width_factor directly
-            options = {
-                'module_height': self.height_pixels,
-                'module_width': self.module_width_pixels,  # Use calculated pixel width
-                'quiet_zone': self.quiet_zone_pixels,
-                'font_size': 0,  # No text below barcode
-                'text_distance': 0,
-                'write_text': False
-            }
-            
-            # Generate as PIL Image
-            img = barcode_instance.render(options)
-            
-            # Ensure it's a PIL Image
-            if not isinstance(img, Image.Image):
-                img = Image.fromarray(img) if hasattr(img, '__array__') else Image.open(img)
-            
-            # Calculate target width based on data length and desired physical size
-            # Estimate: Code 128 has roughly 11 modules per character + start/stop (11 modules)
-            # Each module is module_width_pixels wide
-            estimated_modules = (len(normalized_data) * 11) + 11
-            estimated_width_pixels = estimated_modules * self.module_width_pixels + (2 * self.quiet_zone_pixels)
-            
-            # Calculate target width in mm (we want the barcode to fit reasonably)
-            # For a 12-digit code, target about 40-50mm width
-            target_width_mm = max(30, min(60, len(normalized_data) * 3.5))  # Rough estimate: 3.5mm per digit
-            target_width_pixels = int((target_width_mm / 25.4) * self.dpi)
-            
-            # Resize to target width while maintaining aspect ratio
-            if img.size[0] > target_width_pixels:
-                aspect_ratio = img.size[1] / img.size[0]
-                new_height = int(target_width_pixels * aspect_ratio)
-                img = img.resize((target_width_pixels, new_height), Image.Resampling.LANCZOS)
-            
-            return img
+            return self._render_cached(self._build_modules, normalized_data, *self._render_options)
             
         except Exception as e:
             return None
     
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _render_cached(build_modules: Callable[[str], str], data: str, height_pixels: int,
+                       module_width_pixels: int, quiet_zone_pixels: int, dpi: int) -> Image.Image:
+        """Render a normalized value; memoized on every input that affects the image."""
+        # Encode to the module string, bypassing python-barcode's writers
+        # which paint every module individually
+        modules = build_modules(data)
+        
+        # Rasterize as a single 1-bit pixel row (barcodes are bilevel, so this
+        # stores 8 pixels per byte) and stretch it to the module width
+        # (NEAREST keeps the bar edges exact)
+        row = Image.frombytes('L', (len(modules), 1), modules.encode('ascii').translate(_MODULE_PIXELS))
+        row = row.convert('1', dither=Image.Dither.NONE)
+        bars = row.resize((len(modules) * module_width_pixels, 1), Image.Resampling.NEAREST)
+        
+        # Add the quiet zone on each side while still a single row, then
+        # stretch to the bar height, so the full-size image is written once
+        row = Image.new('1', (bars.size[0] + 2 * quiet_zone_pixels, 1), 1)
+        row.paste(bars, (quiet_zone_pixels, 0))
+        img = row.resize((row.size[0], height_pixels), Image.Resampling.NEAREST)
+        
+        # Fit the barcode to its target print width by declaring the horizontal
+        # resolution instead of resampling, which would blur or unevenly round
+        # the bars
+        target_width_pixels = _target_width_pixels(len(data), dpi)
+        img.info['dpi'] = (img.size[0] * dpi / target_width_pixels, dpi)
+        
+        return img
+    
+    def generate_unique_map(self, values: Sequence[str]) -> Dict[str, Optional[Image.Image]]:
+        """Generate each distinct value once.
+        
+        Returns:
+            Mapping of value to its PIL Image (or None if generation failed)
+        """
+        # Rendering one barcode takes well under a millisecond, less than it
+        # costs to ship the image back from a worker process, so this stays
+        # serial
+        return render_unique_map(self.generate, values)
+    
     def get_width(self, data: str) -> float:
         """Estimate barcode width in mm based on data length.
         
@@ -150,27 +336,7 @@ class BarcodeGenerator:
         and specific characters used.
         """
         # Rough estimation: each character adds approximately width_factor * base_width
-        # Base width per character varies by symbology
-        base_chars = len(data)
-        
-        if self.symbology_name == 'code128':
-            # Code 128: roughly 11 modules per character + start/stop
-            estimated_modules = (base_chars * 11) + 11
-        elif self.symbology_name == 'code39':
-            # Code 39: roughly 13 modules per character + start/stop
-            estimated_modules = (base_chars * 13) + 13
-        elif self.symbology_name == 'ean13':
-            # EAN-13: fixed 95 modules
-            estimated_modules = 95
-        elif self.symbology_name in ['i2of5', 'itf']:
-            # I2OF5: roughly 7 modules per 2 digits + start/stop
-            estimated_modules = ((base_chars // 2) * 7) + 7
-        else:
-            estimated_modules = base_chars * 10
-        
-        # Convert modules to mm (approximate)
-        module_width_mm = (self.width_factor / 25.4) * (300 / self.dpi)  # Rough conversion
-        width_mm = (estimated_modules * module_width_mm) + (2 * self.quiet_zone_mm)
+        per_unit, chars_per_unit, fixed = self._width_modules
+        estimated_modules = (len(data) // chars_per_unit) * per_unit + fixed
         
-        return width_mm
-
+        return (estimated_modules * self._module_width_mm) + self._quiet_zones_mm
@@ -0,0 +1,80 @@
+"""Batch rendering shared by the QR and barcode generators."""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from PIL import Image
+
+# A generator class (or other factory) and the picklable arguments that
+# rebuild it in a worker process
+WorkerSpec = Tuple[Callable[..., Any], tuple]
+
+
+def render_batch(generate: Callable[[str], Optional[Image.Image]], values: Sequence[str],
+                 worker: Optional[WorkerSpec] = None, min_batch: int = 0,
+                 max_workers: Optional[int] = None) -> List[Optional[Image.Image]]:
+    """Render values in order, fanning out across processes for large batches.
+    
+    Args:
+        generate: Renders one value in this process
+        values: Values to render
+        worker: (factory, args) that rebuild the generator in a worker
+            process; None always renders in this process
+        min_batch: Fewest values worth handing to one worker process
+        max_workers: Worker process count (defaults to CPU count)
+    
+    Returns:
+        List of PIL Images (or None on failure) in the same order as values
+    """
+    workers = max_workers or os.cpu_count() or 1
+    if min_batch > 0:
+        # Give every worker at least min_batch values to pay for its startup
+        workers = min(workers, len(values) // min_batch)
+    if worker is None or workers < 2:
+        return [generate(value) for value in values]
+    
+    factory, args = worker
+    chunksize = max(1, len(values) // (4 * workers))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(_render_one, [(factory, args, value) for value in values], chunksize=chunksize))
+    
+    images = []
+    for result in results:
+        img = None
+        if result is not None:
+            mode, size, pixels, info = result
+            img = Image.frombytes(mode, size, pixels)
+            img.info.update(info)
+        images.append(img)
+    return images
+
+
+def render_unique_map(generate: Callable[[str], Optional[Image.Image]], values: Sequence[str],
+                      worker: Optional[WorkerSpec] = None, min_batch: int = 0,
+                      max_workers: Optional[int] = None) -> Dict[str, Optional[Image.Image]]:
+    """Render each distinct value once (see render_batch for the arguments).
+    
+    Returns:
+        Mapping of value to its PIL Image (or None if generation failed)
+    """
+    unique_values = list(dict.fromkeys(values))
+    return dict(zip(unique_values, render_batch(generate, unique_values, worker, min_batch, max_workers)))
+
+
+@lru_cache(maxsize=None)
+def _worker_generator(factory: Callable[..., Any], args: tuple) -> Any:
+    """Build (once per worker process) the generator for a picklable spec."""
+    return factory(*args)
+
+
+def _render_one(job: Tuple[Callable[..., Any], tuple, str]) -> Optional[Tuple[str, Tuple[int, int], bytes, dict]]:
+    """Render a single value in a worker process.
+    
+    Returns raw (mode, size, pixel bytes, info) rather than a PIL Image so
+    the result pickles cheaply back to the parent process.
+    """
+    factory, args, value = job
+    img = _worker_generator(factory, args).generate(value)
+    if img is None:
+        return None
+    return img.mode, img.size, img.tobytes(), img.info
@@ -1,11 +1,72 @@
 """Configuration loading and validation module."""
 import os
 import sys
+from dataclasses import dataclass, fields
 from pathlib import Path
 from typing import Any, Dict, Optional
 import yaml
 import click
 
+# Use libyaml's C parser when PyYAML was built with it
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
+@dataclass(slots=True, frozen=True)
+class InputConfig:
+    """Validated 'input' section."""
+    csv: str
+
+
+@dataclass(slots=True, frozen=True)
+class OutputConfig:
+    """Validated 'output' section."""
+    file: str
+    page_size: str
+    margin_mm: float
+    dpi: int
+    overwrite: bool
+    page_compression: bool
+
+
+@dataclass(slots=True, frozen=True)
+class LayoutConfig:
+    """Validated 'layout' section (label dimensions and grid both resolved)."""
+    label_width_mm: float
+    label_height_mm: float
+    labels_per_row: int
+    labels_per_column: int
+    horizontal_gap_mm: float
+    vertical_gap_mm: float
+    code_arrangement: str
+    code_spacing_mm: float
+
+
+@dataclass(slots=True, frozen=True)
+class QRConfig:
+    """Validated 'qr' section."""
+    size_mm: float
+    error_correction: str
+    quiet_zone: int
+
+
+@dataclass(slots=True, frozen=True)
+class BarcodeConfig:
+    """Validated 'barcode' section."""
+    symbology: str
+    height_mm: float
+    width_factor: float
+    quiet_zone: float
+
+
+@dataclass(slots=True, frozen=True)
+class TextConfig:
+    """Validated 'text' section."""
+    font_size: int
+    font_name: str
+    position: str
+    alignment: str
+    margin_mm: float
+
 
 class Config:
     """Configuration manager with YAML and CLI support."""
@@ -14,8 +75,14 @@ class Config:
     A4_WIDTH_MM = 210
     A4_HEIGHT_MM = 297
     
-    def __init__(self, config_path: Optional[str] = None, cli_overrides: Optional[Dict[str, Any]] = None):
-        """Initialize configuration from YAML and CLI overrides."""
+    def __init__(self, config_path: Optional[str] = None, cli_overrides: Optional[Dict[str, Any]] = None,
+                 check_output: bool = True):
+        """Initialize configuration from YAML and CLI overrides.
+        
+        With check_output=False (dry runs) the output directory is neither
+        created nor checked for an existing file.
+        """
+        self.check_output = check_output
         self.config = self._load_defaults()
         
         if config_path:
@@ -26,6 +93,14 @@ class Config:
             self.config = self._merge_config(self.config, cli_overrides)
         
         self._validate()
+        
+        # Typed, read-only view of each section for attribute access
+        self.input = self._section(InputConfig, 'input')
+        self.output = self._section(OutputConfig, 'output')
+        self.layout = self._section(LayoutConfig, 'layout')
+        self.qr = self._section(QRConfig, 'qr')
+        self.barcode = self._section(BarcodeConfig, 'barcode')
+        self.text = self._section(TextConfig, 'text')
     
     def _load_defaults(self) -> Dict[str, Any]:
         """Load default configuration values."""
@@ -38,7 +113,8 @@ class Config:
                 'page_size': 'A4',
                 'margin_mm': 10,
                 'dpi': 300,
-                'overwrite': False
+                'overwrite': False,
+                'page_compression': True
             },
             'layout': {
                 'label_width_mm': None,
@@ -79,7 +155,7 @@ class Config:
         
         try:
             with open(path, 'r', encoding='utf-8') as f:
-                return yaml.safe_load(f) or {}
+                return yaml.load(f, Loader=_YAML_LOADER) or {}
         except yaml.YAMLError as e:
             click.echo(f"Error: Invalid YAML in configuration file: {e}", err=True)
             sys.exit(1)
@@ -105,6 +181,12 @@ class Config:
             click.echo(f"Error: DPI must be between 72 and 600, got {dpi}", err=True)
             sys.exit(1)
         
+        # Validate page compression
+        page_compression = self.config['output']['page_compression']
+        if not isinstance(page_compression, bool):
+            click.echo(f"Error: page_compression must be true or false, got {page_compression}", err=True)
+            sys.exit(1)
+        
         # Validate margins
         margin_mm = self.config['output']['margin_mm']
         if margin_mm < 0:
@@ -218,23 +300,29 @@ class Config:
         output_path = Path(self.config['output']['file'])
         output_dir = output_path.parent
         
-        # Create output directory if it doesn't exist
-        if output_dir and not output_dir.exists():
-            try:
-                output_dir.mkdir(parents=True, exist_ok=True)
-            except Exception as e:
-                click.echo(f"Error: Cannot create output directory: {e}", err=True)
+        if self.check_output:
+            # Create output directory if it doesn't exist
+            if output_dir and not output_dir.exists():
+                try:
+                    output_dir.mkdir(parents=True, exist_ok=True)
+                except Exception as e:
+                    click.echo(f"Error: Cannot create output directory: {e}", err=True)
+                    sys.exit(1)
+            
+            # Check if output file exists and overwrite setting
+            if output_path.exists() and not self.config['output']['overwrite']:
+                click.echo(f"Error: Output file exists: {output_path}. Use --overwrite to replace.", err=True)
                 sys.exit(1)
         
-        # Check if output file exists and overwrite setting
-        if output_path.exists() and not self.config['output']['overwrite']:
-            click.echo(f"Error: Output file exists: {output_path}. Use --overwrite to replace.", err=True)
-            sys.exit(1)
-        
         # Ensure .pdf extension
         if output_path.suffix.lower() != '.pdf':
             self.config['output']['file'] = str(output_path.with_suffix('.pdf'))
     
+    def _section(self, section_class: type, name: str):
+        """Build a section dataclass from the validated config, ignoring unknown keys."""
+        values = self.config[name]
+        return section_class(**{field.name: values[field.name] for field in fields(section_class)})
+    
     def get(self, *keys):
         """Get configuration value using dot notation."""
         value = self.config
@@ -1,23 +1,61 @@
 """CSV data loading and validation module."""
+import codecs
 import csv
+import io
+import mmap
+import os
 import sys
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Iterable, Iterator, List, Dict, Optional, Tuple
+from dataclasses import dataclass
 import click
 
+try:
+    import cisv  # Optional SIMD CSV parser
+except ImportError:
+    cisv = None
+
 
 class DataEntry:
-    """Represents a single data entry with ID, QR value, and barcode value."""
+    """Represents a single data entry with ID, QR value, and barcode value.
+    
+    Values are expected to be already stripped; empty or missing QR and
+    barcode values fall back to the ID.
+    """
+    
+    __slots__ = ('id', 'qr_value', 'barcode_value')
     
     def __init__(self, id: str, qr_value: Optional[str] = None, barcode_value: Optional[str] = None):
-        self.id = id.strip() if id else ""
-        self.qr_value = (qr_value.strip() if qr_value else self.id) or self.id
-        self.barcode_value = (barcode_value.strip() if barcode_value else self.id) or self.id
+        self.id = id
+        self.qr_value = qr_value or id
+        self.barcode_value = barcode_value or id
+
+
+@dataclass(slots=True)
+class DataTable:
+    """Loaded entries stored column-wise, one list per field."""
+    ids: List[str]
+    qr_values: List[str]
+    barcode_values: List[str]
+    
+    def __len__(self) -> int:
+        return len(self.ids)
+    
+    @property
+    def entries(self) -> List[DataEntry]:
+        """Build row-wise DataEntry objects from the columns."""
+        return [DataEntry(*values) for values in zip(self.ids, self.qr_values, self.barcode_values)]
 
 
 class DataLoader:
     """Loads and validates CSV data."""
     
+    # Bytes checked up front to rule out UTF-8 before decoding the whole file
+    ENCODING_PROBE_BYTES = 64 * 1024
+    
+    # Files at least this large are parsed by cisv across threads when it is installed
+    PARALLEL_PARSE_BYTES = 10 * 1024 * 1024
+    
     def __init__(self, csv_path: str):
         """Initialize data loader with CSV file path."""
         self.csv_path = Path(csv_path)
@@ -27,52 +65,58 @@ class DataLoader:
     
     def load(self) -> List[DataEntry]:
         """Load entries from CSV file."""
-        entries = []
+        return self.load_table().entries
+    
+    def load_table(self) -> DataTable:
+        """Load entries from CSV file as parallel columns."""
+        ids = []
+        qr_values = []
+        barcode_values = []
+        
+        for entry_id, qr_value, barcode_value in self._iter_values():
+            ids.append(entry_id)
+            qr_values.append(qr_value)
+            barcode_values.append(barcode_value)
+        
+        return DataTable(ids, qr_values, barcode_values)
+    
+    def _iter_values(self) -> Iterator[Tuple[str, str, str]]:
+        """Yield (id, qr_value, barcode_value) for each valid row.
+        
+        Values are stripped and empty QR and barcode values already fall
+        back to the ID.
+        """
+        found = False
         
         try:
-            # Try UTF-8 first, fallback to other encodings
-            encodings = ['utf-8', 'utf-8-sig', 'latin-1', 'cp1252']
-            file_handle = None
-            
-            for encoding in encodings:
-                try:
-                    file_handle = open(self.csv_path, 'r', encoding=encoding, newline='')
-                    break
-                except UnicodeDecodeError:
-                    continue
-            
-            if file_handle is None:
-                click.echo(f"Error: Cannot decode CSV file: {self.csv_path}", err=True)
-                sys.exit(1)
+            reader = iter(self._read_rows())
             
-            reader = csv.DictReader(file_handle)
+            # Resolve column positions once from the header
+            header = [name.strip().lower() for name in next(reader, [])]
             
             # Check for required 'id' column
-            if 'id' not in reader.fieldnames:
+            if 'id' not in header:
                 click.echo("Error: CSV file must have an 'id' column", err=True)
                 sys.exit(1)
             
-            row_num = 1  # Start at 1 because header is row 0
-            for row in reader:
-                row_num += 1
-                
-                # Skip empty rows
-                if not any(row.values()):
-                    continue
-                
-                # Get ID (required)
-                entry_id = row.get('id', '').strip()
+            id_idx = header.index('id')
+            qr_idx = header.index('qr_value') if 'qr_value' in header else -1
+            barcode_idx = header.index('barcode_value') if 'barcode_value' in header else -1
+            
+            for row_num, row in enumerate(reader, start=2):  # Header is row 1
+                # Get ID (required); rows that are entirely empty are skipped silently
+                entry_id = row[id_idx].strip() if id_idx < len(row) else ''
                 if not entry_id:
-                    click.echo(f"Warning: Row {row_num} has empty 'id', skipping", err=True)
+                    if any(row):
+                        click.echo(f"Warning: Row {row_num} has empty 'id', skipping", err=True)
                     continue
                 
-                # Get optional qr_value and barcode_value
-                qr_value = row.get('qr_value', '').strip() if 'qr_value' in row else None
-                barcode_value = row.get('barcode_value', '').strip() if 'barcode_value' in row else None
+                # Get optional qr_value and barcode_value (default to the ID)
+                qr_value = row[qr_idx].strip() if 0 <= qr_idx < len(row) else ''
+                barcode_value = row[barcode_idx].strip() if 0 <= barcode_idx < len(row) else ''
                 
-                entries.append(DataEntry(entry_id, qr_value, barcode_value))
-            
-            file_handle.close()
+                found = True
+                yield entry_id, qr_value or entry_id, barcode_value or entry_id
             
         except csv.Error as e:
             click.echo(f"Error: CSV parsing error: {e}", err=True)
@@ -81,9 +125,73 @@ class DataLoader:
             click.echo(f"Error: Failed to read CSV file: {e}", err=True)
             sys.exit(1)
         
-        if not entries:
+        if not found:
             click.echo("Error: No valid entries found in CSV file", err=True)
             sys.exit(1)
+    
+    def _read_rows(self) -> Iterable[List[str]]:
+        """Read and parse the CSV file into rows of fields, in file order."""
+        if cisv is not None and self.csv_path.stat().st_size >= self.PARALLEL_PARSE_BYTES:
+            with open(self.csv_path, 'rb') as f:
+                head = f.read(len(codecs.BOM_UTF8))
+            # cisv reads the file as UTF-8 itself, so leave files with a BOM to _read_text
+            if not head.startswith((codecs.BOM_UTF8, codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+                try:
+                    return cisv.parse_file(str(self.csv_path), parallel=True, num_threads=os.cpu_count() or 0)
+                except cisv.CisvError:
+                    pass  # e.g. not valid UTF-8; decode and parse below
+        
+        return self._parse_rows(self._read_text())
+    
+    def _read_text(self) -> str:
+        """Read the whole CSV file through a memory map and decode it once.
+        
+        The encoding is chosen from a byte order mark if present, otherwise
+        UTF-8, falling back to Windows-1252 and finally Latin-1 (which
+        decodes any byte sequence). Decoding reads straight from the mapped
+        pages, so the file is never copied into an intermediate bytes object.
+        """
+        with open(self.csv_path, 'rb') as f:
+            if self.csv_path.stat().st_size == 0:
+                return ''  # mmap cannot map an empty file
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                head = mm[:len(codecs.BOM_UTF8)]
+                if head.startswith(codecs.BOM_UTF8):
+                    encodings = ('utf-8-sig',)
+                elif head.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+                    encodings = ('utf-16',)
+                else:
+                    encodings = ('utf-8', 'cp1252', 'latin-1')
+                    try:
+                        # Incremental so a character split at the probe boundary is not an error
+                        codecs.getincrementaldecoder('utf-8')().decode(mm[:self.ENCODING_PROBE_BYTES])
+                    except UnicodeDecodeError:
+                        encodings = encodings[1:]
+                
+                with memoryview(mm) as view:
+                    for encoding in encodings[:-1]:
+                        try:
+                            return str(view, encoding)
+                        except UnicodeDecodeError:
+                            continue
+                    return str(view, encodings[-1])
+    
+    @staticmethod
+    def _parse_rows(text: str) -> Iterable[List[str]]:
+        """Split CSV text into rows of fields.
+        
+        Files without quoting or bare carriage returns are split directly on
+        newlines and commas, which gives the same fields as the csv module
+        without its per-character state machine. Other files go through cisv
+        when it is installed, otherwise the csv module.
+        """
+        if '"' in text or text.count('\r') != text.count('\r\n'):
+            if cisv is not None:
+                return cisv.parse_string(text)
+            return csv.reader(io.StringIO(text, newline=''))
         
-        return entries
+        lines = text.split('\n')
+        if lines[-1] == '':
+            lines.pop()  # Trailing newline
+        return (line.rstrip('\r').split(',') for line in lines)
 
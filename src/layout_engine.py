@@ -3,7 +3,7 @@ from typing import Tuple, List, Dict, Any
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class LabelPosition:
     """Position information for a label."""
     row: int
@@ -12,7 +12,7 @@ class LabelPosition:
     y_mm: float
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ContentPosition:
     """Position information for content within a label."""
     qr_x_mm: float
@@ -33,6 +33,9 @@ class LayoutEngine:
     A4_WIDTH_MM = 210
     A4_HEIGHT_MM = 297
     
+    # Label at the page origin, used to build content templates
+    _ORIGIN = LabelPosition(row=0, column=0, x_mm=0.0, y_mm=0.0)
+    
     def __init__(self, config: Dict[str, Any]):
         """Initialize layout engine with configuration."""
         self.config = config
@@ -59,6 +62,38 @@ class LayoutEngine:
         
         # Calculate labels per page
         self.labels_per_page = self.labels_per_row * self.labels_per_column
+        
+        # Per-label constants, resolved once rather than on every call
+        self._margin_mm = margin_mm
+        self._col_stride_mm = self.label_width_mm + self.horizontal_gap_mm
+        self._row_stride_mm = self.label_height_mm + self.vertical_gap_mm
+        # Convert font size from points to mm (1 point = 0.352778 mm)
+        self._font_size_mm = self.text_config['font_size'] * 0.352778
+        self._text_margin_mm = self.text_config['margin_mm']
+        self._text_height_mm = self._font_size_mm + self._text_margin_mm
+        self._qr_size_mm = self.qr_config['size_mm']
+        self._barcode_height_mm = self.barcode_config['height_mm']
+        self._code_spacing_mm = self.layout_config['code_spacing_mm']
+        
+        # Arrangement and text position are fixed for the run, so pick the
+        # matching content layout once
+        arrangement = self.layout_config['code_arrangement']
+        text_pos = self.text_config['position']
+        self._content_fn = getattr(self, f"_content_{arrangement}_{text_pos}")
+        self._has_text = text_pos != 'none'
+        self._content_templates: Dict[float, ContentPosition] = {}
+        
+        # Every page has the same grid, so label positions are computed for
+        # one page and shared (they are immutable) by all pages
+        self._page_positions = []
+        for label_index_on_page in range(self.labels_per_page):
+            row, column = divmod(label_index_on_page, self.labels_per_row)
+            self._page_positions.append(LabelPosition(
+                row=row,
+                column=column,
+                x_mm=self._margin_mm + (column * self._col_stride_mm),
+                y_mm=self._margin_mm + (row * self._row_stride_mm)
+            ))
     
     def get_label_position(self, index: int) -> LabelPosition:
         """Get position for label at given index.
@@ -69,20 +104,17 @@ class LayoutEngine:
         Returns:
             LabelPosition with row, column, and coordinates
         """
-        # Calculate which page this label is on
-        page_index = index // self.labels_per_page
-        label_index_on_page = index % self.labels_per_page
-        
-        # Calculate row and column on current page
-        row = label_index_on_page // self.labels_per_row
-        column = label_index_on_page % self.labels_per_row
-        
-        # Calculate position
-        margin_mm = self.output_config['margin_mm']
-        x_mm = margin_mm + (column * (self.label_width_mm + self.horizontal_gap_mm))
-        y_mm = margin_mm + (row * (self.label_height_mm + self.vertical_gap_mm))
-        
-        return LabelPosition(row=row, column=column, x_mm=x_mm, y_mm=y_mm)
+        return self._page_positions[index % self.labels_per_page]
+    
+    def get_label_positions(self, count: int) -> List[LabelPosition]:
+        """Get positions for labels 0 to count - 1."""
+        full_pages, remainder = divmod(count, self.labels_per_page)
+        return self._page_positions * full_pages + self._page_positions[:remainder]
+    
+    def page_ranges(self, count: int) -> List[Tuple[int, int]]:
+        """Get the (start, end) label index range of each page for count labels."""
+        return [(start, min(start + self.labels_per_page, count))
+                for start in range(0, count, self.labels_per_page)]
     
     def get_page_number(self, index: int) -> int:
         """Get page number for label at given index."""
@@ -98,93 +130,39 @@ class LayoutEngine:
         Returns:
             ContentPosition with all coordinates
         """
-        qr_size_mm = self.qr_config['size_mm']
-        barcode_height_mm = self.barcode_config['height_mm']
-        code_spacing_mm = self.layout_config['code_spacing_mm']
-        arrangement = self.layout_config['code_arrangement']
-        text_pos = self.text_config['position']
-        text_align = self.text_config['alignment']
-        text_margin_mm = self.text_config['margin_mm']
-        font_size_pt = self.text_config['font_size']
+        # The layout within a label only depends on the barcode width, so it
+        # is computed once per width at the origin and translated per label
+        template = self._content_templates.get(barcode_width_mm)
+        if template is None:
+            template = self._content_fn(self._ORIGIN, barcode_width_mm)
+            self._content_templates[barcode_width_mm] = template
         
-        # Convert font size from points to mm (1 point = 0.352778 mm)
-        font_size_mm = font_size_pt * 0.352778
+        x_mm = label_pos.x_mm
+        y_mm = label_pos.y_mm
+        # Without text the text coordinates stay at 0
+        text_x_mm, text_y_mm = (x_mm, y_mm) if self._has_text else (0, 0)
         
-        if arrangement == 'horizontal':
-            # QR and barcode side by side
-            total_width = qr_size_mm + code_spacing_mm + barcode_width_mm
-            start_x = label_pos.x_mm + (self.label_width_mm - total_width) / 2
-            
-            # QR position
-            qr_x_mm = start_x
-            if text_pos == 'bottom':
-                qr_y_mm = label_pos.y_mm + (self.label_height_mm - qr_size_mm - font_size_mm - text_margin_mm) / 2
-            else:  # top or none
-                qr_y_mm = label_pos.y_mm + (self.label_height_mm - qr_size_mm) / 2
-            
-            # Barcode position
-            barcode_x_mm = qr_x_mm + qr_size_mm + code_spacing_mm
-            barcode_y_mm = label_pos.y_mm + (self.label_height_mm - barcode_height_mm) / 2
-            
-            # Text positions (below each code, aligned with the code)
-            if text_pos == 'bottom':
-                text_y_mm = label_pos.y_mm + self.label_height_mm - font_size_mm - text_margin_mm
-                # QR text - centered under QR code
-                qr_text_x_mm = qr_x_mm + qr_size_mm / 2
-                # Barcode text - centered under barcode
-                barcode_text_x_mm = barcode_x_mm + barcode_width_mm / 2
-            elif text_pos == 'top':
-                text_y_mm = label_pos.y_mm + text_margin_mm
-                # QR text - centered above QR code
-                qr_text_x_mm = qr_x_mm + qr_size_mm / 2
-                # Barcode text - centered above barcode
-                barcode_text_x_mm = barcode_x_mm + barcode_width_mm / 2
-            else:  # none
-                qr_text_x_mm = 0
-                qr_text_y_mm = 0
-                barcode_text_x_mm = 0
-                barcode_text_y_mm = 0
-                text_y_mm = 0
-        
-        else:  # vertical
-            # QR on top, barcode below
-            qr_x_mm = label_pos.x_mm + (self.label_width_mm - qr_size_mm) / 2
-            
-            if text_pos == 'top':
-                # Text at top, then QR code
-                qr_y_mm = label_pos.y_mm + font_size_mm + text_margin_mm + text_margin_mm
-                qr_text_y_mm = label_pos.y_mm + text_margin_mm
-            elif text_pos == 'bottom':
-                # Calculate positions: QR, then text, then barcode, then text
-                # Start from top, leaving space for barcode and its text at bottom
-                space_needed_bottom = barcode_height_mm + font_size_mm + text_margin_mm
-                available_for_qr = self.label_height_mm - space_needed_bottom - code_spacing_mm
-                qr_y_mm = label_pos.y_mm + (available_for_qr - qr_size_mm) / 2
-                qr_text_y_mm = qr_y_mm + qr_size_mm + text_margin_mm
-            else:  # none
-                # Center QR and barcode without text
-                available_height = self.label_height_mm - code_spacing_mm
-                qr_y_mm = label_pos.y_mm + (available_height - qr_size_mm - barcode_height_mm) / 2
-                qr_text_y_mm = 0
-            
-            # Barcode position
-            barcode_x_mm = label_pos.x_mm + (self.label_width_mm - barcode_width_mm) / 2
-            
-            if text_pos == 'bottom':
-                # Barcode above its text
-                barcode_y_mm = label_pos.y_mm + self.label_height_mm - barcode_height_mm - font_size_mm - text_margin_mm
-                barcode_text_y_mm = label_pos.y_mm + self.label_height_mm - font_size_mm - text_margin_mm
-            elif text_pos == 'top':
-                # Barcode below QR text
-                barcode_y_mm = qr_y_mm + qr_size_mm + code_spacing_mm
-                barcode_text_y_mm = barcode_y_mm + barcode_height_mm + text_margin_mm
-            else:  # none
-                barcode_y_mm = qr_y_mm + qr_size_mm + code_spacing_mm
-                barcode_text_y_mm = 0
-            
-            # Text X positions (centered under each code)
-            qr_text_x_mm = qr_x_mm + qr_size_mm / 2
-            barcode_text_x_mm = barcode_x_mm + barcode_width_mm / 2
+        return ContentPosition(
+            qr_x_mm=template.qr_x_mm + x_mm,
+            qr_y_mm=template.qr_y_mm + y_mm,
+            barcode_x_mm=template.barcode_x_mm + x_mm,
+            barcode_y_mm=template.barcode_y_mm + y_mm,
+            barcode_width_mm=barcode_width_mm,
+            qr_text_x_mm=template.qr_text_x_mm + text_x_mm,
+            qr_text_y_mm=template.qr_text_y_mm + text_y_mm,
+            barcode_text_x_mm=template.barcode_text_x_mm + text_x_mm,
+            barcode_text_y_mm=template.barcode_text_y_mm + text_y_mm
+        )
+    
+    # One specialization per (code_arrangement, text position), selected in __init__
+    
+    def _content_horizontal_top(self, label_pos: LabelPosition, barcode_width_mm: float) -> ContentPosition:
+        """QR and barcode side by side, text above each code."""
+        qr_x_mm = label_pos.x_mm + (self.label_width_mm - self._qr_size_mm - self._code_spacing_mm - barcode_width_mm) / 2
+        qr_y_mm = label_pos.y_mm + (self.label_height_mm - self._qr_size_mm) / 2
+        barcode_x_mm = qr_x_mm + self._qr_size_mm + self._code_spacing_mm
+        barcode_y_mm = label_pos.y_mm + (self.label_height_mm - self._barcode_height_mm) / 2
+        text_y_mm = label_pos.y_mm + self._text_margin_mm
         
         return ContentPosition(
             qr_x_mm=qr_x_mm,
@@ -192,9 +170,102 @@ class LayoutEngine:
             barcode_x_mm=barcode_x_mm,
             barcode_y_mm=barcode_y_mm,
             barcode_width_mm=barcode_width_mm,
-            qr_text_x_mm=qr_text_x_mm if text_pos != 'none' else 0,
-            qr_text_y_mm=text_y_mm if text_pos != 'none' else 0,
-            barcode_text_x_mm=barcode_text_x_mm if text_pos != 'none' else 0,
-            barcode_text_y_mm=text_y_mm if text_pos != 'none' else 0
+            qr_text_x_mm=qr_x_mm + self._qr_size_mm / 2,
+            qr_text_y_mm=text_y_mm,
+            barcode_text_x_mm=barcode_x_mm + barcode_width_mm / 2,
+            barcode_text_y_mm=text_y_mm
+        )
+    
+    def _content_horizontal_bottom(self, label_pos: LabelPosition, barcode_width_mm: float) -> ContentPosition:
+        """QR and barcode side by side, text below each code."""
+        qr_x_mm = label_pos.x_mm + (self.label_width_mm - self._qr_size_mm - self._code_spacing_mm - barcode_width_mm) / 2
+        qr_y_mm = label_pos.y_mm + (self.label_height_mm - self._qr_size_mm - self._text_height_mm) / 2
+        barcode_x_mm = qr_x_mm + self._qr_size_mm + self._code_spacing_mm
+        barcode_y_mm = label_pos.y_mm + (self.label_height_mm - self._barcode_height_mm) / 2
+        text_y_mm = label_pos.y_mm + self.label_height_mm - self._text_height_mm
+        
+        return ContentPosition(
+            qr_x_mm=qr_x_mm,
+            qr_y_mm=qr_y_mm,
+            barcode_x_mm=barcode_x_mm,
+            barcode_y_mm=barcode_y_mm,
+            barcode_width_mm=barcode_width_mm,
+            qr_text_x_mm=qr_x_mm + self._qr_size_mm / 2,
+            qr_text_y_mm=text_y_mm,
+            barcode_text_x_mm=barcode_x_mm + barcode_width_mm / 2,
+            barcode_text_y_mm=text_y_mm
+        )
+    
+    def _content_horizontal_none(self, label_pos: LabelPosition, barcode_width_mm: float) -> ContentPosition:
+        """QR and barcode side by side, no text."""
+        qr_x_mm = label_pos.x_mm + (self.label_width_mm - self._qr_size_mm - self._code_spacing_mm - barcode_width_mm) / 2
+        
+        return ContentPosition(
+            qr_x_mm=qr_x_mm,
+            qr_y_mm=label_pos.y_mm + (self.label_height_mm - self._qr_size_mm) / 2,
+            barcode_x_mm=qr_x_mm + self._qr_size_mm + self._code_spacing_mm,
+            barcode_y_mm=label_pos.y_mm + (self.label_height_mm - self._barcode_height_mm) / 2,
+            barcode_width_mm=barcode_width_mm,
+            qr_text_x_mm=0,
+            qr_text_y_mm=0,
+            barcode_text_x_mm=0,
+            barcode_text_y_mm=0
+        )
+    
+    def _content_vertical_top(self, label_pos: LabelPosition, barcode_width_mm: float) -> ContentPosition:
+        """QR above barcode, text above each code."""
+        qr_x_mm = label_pos.x_mm + (self.label_width_mm - self._qr_size_mm) / 2
+        qr_y_mm = label_pos.y_mm + self._font_size_mm + 2 * self._text_margin_mm
+        barcode_x_mm = label_pos.x_mm + (self.label_width_mm - barcode_width_mm) / 2
+        barcode_y_mm = qr_y_mm + self._qr_size_mm + self._code_spacing_mm
+        
+        return ContentPosition(
+            qr_x_mm=qr_x_mm,
+            qr_y_mm=qr_y_mm,
+            barcode_x_mm=barcode_x_mm,
+            barcode_y_mm=barcode_y_mm,
+            barcode_width_mm=barcode_width_mm,
+            qr_text_x_mm=qr_x_mm + self._qr_size_mm / 2,
+            qr_text_y_mm=label_pos.y_mm + self._text_margin_mm,
+            barcode_text_x_mm=barcode_x_mm + barcode_width_mm / 2,
+            barcode_text_y_mm=barcode_y_mm + self._barcode_height_mm + self._text_margin_mm
+        )
+    
+    def _content_vertical_bottom(self, label_pos: LabelPosition, barcode_width_mm: float) -> ContentPosition:
+        """QR above barcode, text below each code."""
+        # Leave space for the barcode and its text at the bottom, center the QR above
+        available_for_qr = self.label_height_mm - self._barcode_height_mm - self._text_height_mm - self._code_spacing_mm
+        qr_x_mm = label_pos.x_mm + (self.label_width_mm - self._qr_size_mm) / 2
+        qr_y_mm = label_pos.y_mm + (available_for_qr - self._qr_size_mm) / 2
+        barcode_x_mm = label_pos.x_mm + (self.label_width_mm - barcode_width_mm) / 2
+        barcode_text_y_mm = label_pos.y_mm + self.label_height_mm - self._text_height_mm
+        
+        return ContentPosition(
+            qr_x_mm=qr_x_mm,
+            qr_y_mm=qr_y_mm,
+            barcode_x_mm=barcode_x_mm,
+            barcode_y_mm=barcode_text_y_mm - self._barcode_height_mm,
+            barcode_width_mm=barcode_width_mm,
+            qr_text_x_mm=qr_x_mm + self._qr_size_mm / 2,
+            qr_text_y_mm=qr_y_mm + self._qr_size_mm + self._text_margin_mm,
+            barcode_text_x_mm=barcode_x_mm + barcode_width_mm / 2,
+            barcode_text_y_mm=barcode_text_y_mm
+        )
+    
+    def _content_vertical_none(self, label_pos: LabelPosition, barcode_width_mm: float) -> ContentPosition:
+        """QR above barcode, no text."""
+        # Center QR and barcode without text
+        available_height = self.label_height_mm - self._code_spacing_mm
+        qr_y_mm = label_pos.y_mm + (available_height - self._qr_size_mm - self._barcode_height_mm) / 2
+        
+        return ContentPosition(
+            qr_x_mm=label_pos.x_mm + (self.label_width_mm - self._qr_size_mm) / 2,
+            qr_y_mm=qr_y_mm,
+            barcode_x_mm=label_pos.x_mm + (self.label_width_mm - barcode_width_mm) / 2,
+            barcode_y_mm=qr_y_mm + self._qr_size_mm + self._code_spacing_mm,
+            barcode_width_mm=barcode_width_mm,
+            qr_text_x_mm=0,
+            qr_text_y_mm=0,
+            barcode_text_x_mm=0,
+            barcode_text_y_mm=0
         )
-
@@ -1,14 +1,42 @@
 """Main CLI entry point."""
 import click
 import sys
+from itertools import compress
 from pathlib import Path
 
 from .config import Config
 from .data_loader import DataLoader
-from .qr_generator import QRGenerator
-from .barcode_generator import BarcodeGenerator
-from .layout_engine import LayoutEngine
-from .pdf_exporter import PDFExporter
+
+
+# CLI option -> (config section, config key) it overrides
+_CLI_OVERRIDES = (
+    ('csv', 'input', 'csv'),
+    ('output', 'output', 'file'),
+    ('overwrite', 'output', 'overwrite'),
+    ('margin_mm', 'output', 'margin_mm'),
+    ('dpi', 'output', 'dpi'),
+    ('label_width_mm', 'layout', 'label_width_mm'),
+    ('label_height_mm', 'layout', 'label_height_mm'),
+    ('labels_per_row', 'layout', 'labels_per_row'),
+    ('labels_per_column', 'layout', 'labels_per_column'),
+    ('horizontal_gap_mm', 'layout', 'horizontal_gap_mm'),
+    ('vertical_gap_mm', 'layout', 'vertical_gap_mm'),
+    ('code_arrangement', 'layout', 'code_arrangement'),
+    ('code_spacing_mm', 'layout', 'code_spacing_mm'),
+    ('qr_size_mm', 'qr', 'size_mm'),
+    ('qr_error_correction', 'qr', 'error_correction'),
+    ('qr_quiet_zone', 'qr', 'quiet_zone'),
+    ('barcode_symbology', 'barcode', 'symbology'),
+    ('barcode_height_mm', 'barcode', 'height_mm'),
+    ('barcode_width_factor', 'barcode', 'width_factor'),
+    ('barcode_quiet_zone', 'barcode', 'quiet_zone'),
+    ('text_font_size', 'text', 'font_size'),
+    ('text_font_name', 'text', 'font_name'),
+    ('text_position', 'text', 'position'),
+    ('text_alignment', 'text', 'alignment'),
+    ('text_margin_mm', 'text', 'margin_mm'),
+)
+_CLI_SECTIONS = tuple(dict.fromkeys(section for _, section, _ in _CLI_OVERRIDES))
 
 
 @click.command()
@@ -39,130 +67,88 @@ from .pdf_exporter import PDFExporter
 @click.option('--text-alignment', type=click.Choice(['left', 'center', 'right']), help='Text alignment')
 @click.option('--text-margin-mm', type=float, help='Text margin from codes in mm')
 @click.option('--debug', is_flag=True, help='Save debug images to debug/ folder')
+@click.option('--dry-run', is_flag=True, help='Validate configuration and CSV data without generating the PDF')
 def main(**kwargs):
     """Generate print-ready A4 PDFs with QR codes and barcodes."""
     
-    # Build CLI overrides dictionary
-    cli_overrides = {}
-    
-    if kwargs.get('csv'):
-        cli_overrides.setdefault('input', {})['csv'] = kwargs['csv']
-    
-    if kwargs.get('output'):
-        cli_overrides.setdefault('output', {})['file'] = kwargs['output']
-    
-    if kwargs.get('overwrite') is not None:
-        cli_overrides.setdefault('output', {})['overwrite'] = kwargs['overwrite']
-    
-    if kwargs.get('margin_mm') is not None:
-        cli_overrides.setdefault('output', {})['margin_mm'] = kwargs['margin_mm']
-    
-    if kwargs.get('dpi') is not None:
-        cli_overrides.setdefault('output', {})['dpi'] = kwargs['dpi']
-    
-    if kwargs.get('label_width_mm') is not None:
-        cli_overrides.setdefault('layout', {})['label_width_mm'] = kwargs['label_width_mm']
-    
-    if kwargs.get('label_height_mm') is not None:
-        cli_overrides.setdefault('layout', {})['label_height_mm'] = kwargs['label_height_mm']
-    
-    if kwargs.get('labels_per_row') is not None:
-        cli_overrides.setdefault('layout', {})['labels_per_row'] = kwargs['labels_per_row']
-    
-    if kwargs.get('labels_per_column') is not None:
-        cli_overrides.setdefault('layout', {})['labels_per_column'] = kwargs['labels_per_column']
-    
-    if kwargs.get('horizontal_gap_mm') is not None:
-        cli_overrides.setdefault('layout', {})['horizontal_gap_mm'] = kwargs['horizontal_gap_mm']
-    
-    if kwargs.get('vertical_gap_mm') is not None:
-        cli_overrides.setdefault('layout', {})['vertical_gap_mm'] = kwargs['vertical_gap_mm']
-    
-    if kwargs.get('code_arrangement'):
-        cli_overrides.setdefault('layout', {})['code_arrangement'] = kwargs['code_arrangement']
-    
-    if kwargs.get('code_spacing_mm') is not None:
-        cli_overrides.setdefault('layout', {})['code_spacing_mm'] = kwargs['code_spacing_mm']
-    
-    if kwargs.get('qr_size_mm') is not None:
-        cli_overrides.setdefault('qr', {})['size_mm'] = kwargs['qr_size_mm']
-    
-    if kwargs.get('qr_error_correction'):
-        cli_overrides.setdefault('qr', {})['error_correction'] = kwargs['qr_error_correction']
-    
-    if kwargs.get('qr_quiet_zone') is not None:
-        cli_overrides.setdefault('qr', {})['quiet_zone'] = kwargs['qr_quiet_zone']
-    
-    if kwargs.get('barcode_symbology'):
-        cli_overrides.setdefault('barcode', {})['symbology'] = kwargs['barcode_symbology']
-    
-    if kwargs.get('barcode_height_mm') is not None:
-        cli_overrides.setdefault('barcode', {})['height_mm'] = kwargs['barcode_height_mm']
-    
-    if kwargs.get('barcode_width_factor') is not None:
-        cli_overrides.setdefault('barcode', {})['width_factor'] = kwargs['barcode_width_factor']
-    
-    if kwargs.get('barcode_quiet_zone') is not None:
-        cli_overrides.setdefault('barcode', {})['quiet_zone'] = kwargs['barcode_quiet_zone']
-    
-    if kwargs.get('text_font_size') is not None:
-        cli_overrides.setdefault('text', {})['font_size'] = kwargs['text_font_size']
-    
-    if kwargs.get('text_font_name'):
-        cli_overrides.setdefault('text', {})['font_name'] = kwargs['text_font_name']
-    
-    if kwargs.get('text_position'):
-        cli_overrides.setdefault('text', {})['position'] = kwargs['text_position']
-    
-    if kwargs.get('text_alignment'):
-        cli_overrides.setdefault('text', {})['alignment'] = kwargs['text_alignment']
-    
-    if kwargs.get('text_margin_mm') is not None:
-        cli_overrides.setdefault('text', {})['margin_mm'] = kwargs['text_margin_mm']
+    # Build CLI overrides dictionary (empty strings count as not given)
+    cli_overrides = {section: {} for section in _CLI_SECTIONS}
+    for option, section, key in _CLI_OVERRIDES:
+        value = kwargs.get(option)
+        if value is not None and value != '':
+            cli_overrides[section][key] = value
+    cli_overrides = {section: values for section, values in cli_overrides.items() if values}
     
     # Load configuration
     try:
-        config = Config(config_path=kwargs.get('config'), cli_overrides=cli_overrides)
+        config = Config(config_path=kwargs.get('config'), cli_overrides=cli_overrides,
+                        check_output=not kwargs.get('dry_run'))
     except SystemExit:
         sys.exit(1)
     
     # Load data
     try:
-        data_loader = DataLoader(config.get('input', 'csv'))
-        entries = data_loader.load()
+        data_loader = DataLoader(config.input.csv)
+        entries = data_loader.load_table()
     except SystemExit:
         sys.exit(1)
     
-    # Initialize generators
-    qr_gen = QRGenerator(
-        size_mm=config.get('qr', 'size_mm'),
-        error_correction=config.get('qr', 'error_correction'),
-        quiet_zone=config.get('qr', 'quiet_zone'),
-        dpi=config.get('output', 'dpi')
-    )
+    # Imported only once config and data have loaded, so --help and input
+    # errors do not pay for PIL, qrcode and reportlab
+    from .barcode_generator import BarcodeGenerator
     
     barcode_gen = BarcodeGenerator(
-        symbology=config.get('barcode', 'symbology'),
-        height_mm=config.get('barcode', 'height_mm'),
-        width_factor=config.get('barcode', 'width_factor'),
-        quiet_zone_mm=config.get('barcode', 'quiet_zone'),
-        dpi=config.get('output', 'dpi')
+        symbology=config.barcode.symbology,
+        height_mm=config.barcode.height_mm,
+        width_factor=config.barcode.width_factor,
+        quiet_zone_mm=config.barcode.quiet_zone,
+        dpi=config.output.dpi
     )
     
+    # Entries with invalid barcode data are reported here and skipped by the
+    # exporter, which is handed the same validity flags
+    valid = barcode_gen.report_invalid(entries.ids, entries.barcode_values)
+    
+    # Dry run: stop before any code is rendered
+    if kwargs.get('dry_run'):
+        valid_count = sum(valid)
+        click.echo(f"Dry run: {valid_count} labels would be generated, "
+                   f"{len(entries) - valid_count} invalid entries skipped")
+        sys.exit(0)
+    
+    from .qr_generator import QRGenerator
+    from .layout_engine import LayoutEngine
+    from .pdf_exporter import PDFExporter
+    
+    qr_gen = QRGenerator(
+        size_mm=config.qr.size_mm,
+        error_correction=config.qr.error_correction,
+        quiet_zone=config.qr.quiet_zone,
+        dpi=config.output.dpi
+    )
+    
+    # Render every distinct code before layout starts (QR codes in parallel
+    # across processes for large batches)
+    precomputed_images = {
+        'barcode': barcode_gen.generate_unique_map(list(compress(entries.barcode_values, valid))),
+        'qr': qr_gen.generate_unique_map(list(compress(entries.qr_values, valid))),
+    }
+    
     # Initialize layout engine
     layout_engine = LayoutEngine(config.config)
     
     # Initialize PDF exporter
     debug_mode = kwargs.get('debug', False)
-    pdf_exporter = PDFExporter(config, qr_gen, barcode_gen, layout_engine, debug=debug_mode)
+    pdf_exporter = PDFExporter(config, qr_gen, barcode_gen, layout_engine, debug=debug_mode,
+                               precomputed_images=precomputed_images)
     
     # Generate PDF
     try:
-        successful, skipped = pdf_exporter.export(entries)
+        successful, skipped = pdf_exporter.export(entries, valid)
         
         # Print summary
         click.echo(f"Generated {successful} labels, skipped {skipped} invalid entries")
-        click.echo(f"Output saved to: {config.get('output', 'file')}")
+        click.echo(f"Output saved to: {config.output.file}")
         
         if skipped > 0:
             sys.exit(0)  # Success but with warnings
@@ -4,11 +4,14 @@ from reportlab.lib.units import mm
 from reportlab.pdfgen import canvas
 from reportlab.lib.utils import ImageReader
 from PIL import Image
-from typing import Optional, List
-from io import BytesIO
+from typing import Dict, Optional, Sequence, Union
+import os
 import sys
+from itertools import compress
+from pathlib import Path
+import click
 
-from .data_loader import DataEntry
+from .data_loader import DataEntry, DataTable
 from .qr_generator import QRGenerator
 from .barcode_generator import BarcodeGenerator
 from .layout_engine import LayoutEngine, LabelPosition, ContentPosition
@@ -19,7 +22,8 @@ class PDFExporter:
     """Exports labels to PDF using reportlab."""
     
     def __init__(self, config: Config, qr_gen: QRGenerator, barcode_gen: BarcodeGenerator, 
-                 layout_engine: LayoutEngine, debug: bool = False):
+                 layout_engine: LayoutEngine, debug: bool = False,
+                 precomputed_images: Optional[Dict[str, Dict[str, Optional[Image.Image]]]] = None):
         """Initialize PDF exporter.
         
         Args:
@@ -28,27 +32,42 @@ class PDFExporter:
             barcode_gen: Barcode generator
             layout_engine: Layout calculation engine
             debug: If True, save debug images to debug/ folder
+            precomputed_images: Already generated images by kind ('qr' or
+                'barcode') and value; values not found are generated on export
         """
         self.config = config
         self.qr_gen = qr_gen
         self.barcode_gen = barcode_gen
         self.layout_engine = layout_engine
-        self.output_path = config.get('output', 'file')
-        self.dpi = config.get('output', 'dpi')
+        self.output_path = config.output.file
+        self.dpi = config.output.dpi
         self.debug = debug
+        self.precomputed_images = precomputed_images or {}
         
         # ReportLab uses mm directly, but we need to account for DPI scaling in images
         # 1 mm = 2.83465 points (72 points/inch / 25.4 mm/inch)
         self.mm_to_points = 72.0 / 25.4
         
+        # Page height in points, for flipping top-based y coordinates
+        self.page_height_pt = A4[1]
+        
         self.canvas = None
-        self.current_page = -1
+        self._image_forms = {}
         
         # Setup debug folder if needed
         if self.debug:
-            from pathlib import Path
             self.debug_dir = Path('debug')
             self.debug_dir.mkdir(exist_ok=True)
+            # Per-label debug file names are formatted straight onto this prefix
+            self._debug_prefix = os.path.join(self.debug_dir, '')
+    
+    def _get_images(self, kind: str, generator: Union[QRGenerator, BarcodeGenerator], values: Sequence[str]) -> Dict[str, Optional[Image.Image]]:
+        """Map each value to its image, generating only those not precomputed."""
+        images = self.precomputed_images.get(kind, {})
+        missing = [value for value in dict.fromkeys(values) if value not in images]
+        if missing:
+            images = {**images, **generator.generate_unique_map(missing)}
+        return images
     
     def _mm_to_points(self, mm_value: float) -> float:
         """Convert millimeters to points for reportlab."""
@@ -57,18 +76,15 @@ class PDFExporter:
     def _start_new_page(self):
         """Start a new PDF page."""
         if self.canvas is None:
-            self.canvas = canvas.Canvas(self.output_path, pagesize=A4)
-        
-        self.current_page += 1
-        if self.current_page > 0:
+            self.canvas = canvas.Canvas(self.output_path, pagesize=A4,
+                                        pageCompression=int(self.config.output.page_compression))
+        else:
             self.canvas.showPage()
-    
-    def _image_to_bytes(self, img: Image.Image) -> BytesIO:
-        """Convert PIL Image to BytesIO for reportlab."""
-        buffer = BytesIO()
-        img.save(buffer, format='PNG')
-        buffer.seek(0)
-        return buffer
+        
+        # Each page starts with a fresh graphics state, so set the label font
+        # here once rather than before every string
+        if self.config.text.position != 'none':
+            self.canvas.setFont(self.config.text.font_name, self.config.text.font_size)
     
     def _draw_image(self, img: Image.Image, x_mm: float, y_mm: float, width_mm: Optional[float] = None, 
                    height_mm: Optional[float] = None):
@@ -101,13 +117,31 @@ class PDFExporter:
             height_mm_used = height_mm_calc
         
         # ReportLab uses bottom-left origin, convert from top-left
-        # A4 height is 297mm, y_mm is from top, so bottom is at (297 - y_mm)
-        # But we need the bottom-left corner of the image
-        y_pt = (297 - y_mm - height_mm_used) * mm
+        # y_mm is from top, but we need the bottom-left corner of the image
+        y_pt = self.page_height_pt - (y_mm + height_mm_used) * mm
         
-        # Draw image
-        img_bytes = self._image_to_bytes(img)
-        self.canvas.drawImage(ImageReader(img_bytes), x_pt, y_pt, width_pt, height_pt)
+        # Embed each distinct image once as a form XObject and reference it
+        # by name on every later draw. drawImage would re-hash the full image
+        # data on each call just to find the XObject it already embedded.
+        # The source image is kept alongside so its id() stays unique while cached.
+        cached = self._image_forms.get(id(img))
+        if cached is None:
+            source = img
+            # ReportLab expands 1-bit images to RGB; grayscale embeds at a third of the size
+            if img.mode == '1':
+                img = img.convert('L')
+            form_name = f"img{len(self._image_forms)}"
+            self.canvas.beginForm(form_name, 0, 0, 1, 1)
+            self.canvas.drawImage(ImageReader(img), 0, 0, 1, 1)
+            self.canvas.endForm()
+            cached = (source, form_name)
+            self._image_forms[id(source)] = cached
+        
+        # Draw the image form scaled into place
+        self.canvas.saveState()
+        self.canvas.transform(width_pt, 0, 0, height_pt, x_pt, y_pt)
+        self.canvas.doForm(cached[1])
+        self.canvas.restoreState()
     
     def _draw_text(self, text: str, x_mm: float, y_mm: float, alignment: Optional[str] = None):
         """Draw text on canvas at specified position.
@@ -118,34 +152,34 @@ class PDFExporter:
             y_mm: Y position in mm (from top) - this is the baseline of the text
             alignment: Override alignment ('left', 'center', 'right'), or None to use config
         """
-        text_config = self.config.get('text')
-        font_name = text_config['font_name']
-        font_size = text_config['font_size']
-        text_align = alignment if alignment is not None else text_config['alignment']
+        text_align = alignment if alignment is not None else self.config.text.alignment
         
         # Use reportlab's mm unit directly
         x_pt = x_mm * mm
         
         # ReportLab uses bottom-left origin, convert from top-left
         # y_mm is the baseline from top, so convert to bottom-left
-        y_pt = (297 - y_mm) * mm
-        
-        self.canvas.setFont(font_name, font_size)
+        y_pt = self.page_height_pt - y_mm * mm
         
         # Handle alignment
         if text_align == 'center':
             self.canvas.drawCentredString(x_pt, y_pt, text)
         elif text_align == 'right':
-            text_width = self.canvas.stringWidth(text, font_name, font_size)
             self.canvas.drawRightString(x_pt, y_pt, text)
         else:  # left
             self.canvas.drawString(x_pt, y_pt, text)
     
-    def export(self, entries: List[DataEntry]) -> tuple[int, int]:
+    def export(self, entries: Union[DataTable, Sequence[DataEntry]],
+               valid: Optional[Sequence[bool]] = None) -> tuple[int, int]:
         """Export entries to PDF.
         
+        Works column-wise in three passes: validate every barcode value,
+        generate every distinct code, then draw.
+        
         Args:
-            entries: List of data entries to export
+            entries: Data table (or list of data entries) to export
+            valid: Per-entry barcode validity, if the caller has already
+                validated (and reported) the entries
             
         Returns:
             Tuple of (successful_count, skipped_count)
@@ -153,91 +187,105 @@ class PDFExporter:
         successful = 0
         skipped = 0
         
-        for index, entry in enumerate(entries):
-            # Validate barcode data
-            is_valid, error_msg = self.barcode_gen.validate(entry.barcode_value)
-            if not is_valid:
-                import click
-                click.echo(f"Warning: Skipping {entry.id}: {error_msg}", err=True)
-                skipped += 1
-                continue
-            
-            # Generate QR code
-            qr_img = self.qr_gen.generate(entry.qr_value)
-            if qr_img is None:
-                import click
-                click.echo(f"Warning: Failed to generate QR for ID: {entry.id}", err=True)
-                skipped += 1
-                continue
-            
-            # Save debug QR image
-            if self.debug:
-                qr_debug_path = self.debug_dir / f"qr_{entry.id}_{index}.png"
-                qr_img.save(qr_debug_path)
-                import click
-                click.echo(f"Debug: Saved QR image to {qr_debug_path} (size: {qr_img.size})", err=True)
-            
-            # Generate barcode
-            barcode_img = self.barcode_gen.generate(entry.barcode_value)
-            if barcode_img is None:
-                import click
-                click.echo(f"Warning: Failed to generate barcode for ID: {entry.id}", err=True)
-                skipped += 1
+        if isinstance(entries, DataTable):
+            ids, qr_values, barcode_values = entries.ids, entries.qr_values, entries.barcode_values
+        else:
+            ids = [entry.id for entry in entries]
+            qr_values = [entry.qr_value for entry in entries]
+            barcode_values = [entry.barcode_value for entry in entries]
+        
+        # Pass 1: validate barcode data up front so generation can be batched
+        if valid is None:
+            valid = self.barcode_gen.report_invalid(ids, barcode_values)
+        
+        # Pass 2: generate each distinct code once
+        barcode_images = self._get_images('barcode', self.barcode_gen, list(compress(barcode_values, valid)))
+        qr_images = self._get_images('qr', self.qr_gen, list(compress(qr_values, valid)))
+        label_positions = self.layout_engine.get_label_positions(len(ids))
+        
+        # Loop invariants
+        text_enabled = self.config.text.position != 'none'
+        qr_size_mm = self.qr_gen.size_mm
+        barcode_height_mm = self.barcode_gen.height_mm
+        
+        # Pass 3: draw, one page of labels at a time. Pages whose entries
+        # were all rejected are left out rather than emitted blank.
+        for page_start, page_end in self.layout_engine.page_ranges(len(ids)):
+            if not any(valid[page_start:page_end]):
+                skipped += page_end - page_start
                 continue
+            self._start_new_page()
             
-            # Save debug barcode image
-            if self.debug:
-                barcode_debug_path = self.debug_dir / f"barcode_{entry.id}_{index}.png"
-                barcode_img.save(barcode_debug_path)
-                import click
-                click.echo(f"Debug: Saved barcode image to {barcode_debug_path} (size: {barcode_img.size})", err=True)
-            
-            # Get label position
-            label_pos = self.layout_engine.get_label_position(index)
-            page_num = self.layout_engine.get_page_number(index)
-            
-            # Start new page if needed
-            if page_num != self.current_page:
-                self._start_new_page()
-            
-            # Calculate barcode width in mm
-            barcode_width_pixels = barcode_img.size[0]
-            barcode_width_mm = (barcode_width_pixels / self.dpi) * 25.4
-            
-            # Get content positions
-            content_pos = self.layout_engine.get_content_position(label_pos, barcode_width_mm)
-            
-            # Get text config for debug output
-            text_config = self.config.get('text')
-            
-            # Debug output for positions
-            if self.debug:
-                import click
-                click.echo(f"Debug: Label {index} ({entry.id}) positions:", err=True)
-                click.echo(f"  Label: x={label_pos.x_mm:.2f}mm, y={label_pos.y_mm:.2f}mm", err=True)
-                click.echo(f"  QR: x={content_pos.qr_x_mm:.2f}mm, y={content_pos.qr_y_mm:.2f}mm, size={self.qr_gen.size_mm}mm", err=True)
-                click.echo(f"  Barcode: x={content_pos.barcode_x_mm:.2f}mm, y={content_pos.barcode_y_mm:.2f}mm, w={barcode_width_mm:.2f}mm, h={self.barcode_gen.height_mm}mm", err=True)
-                if text_config['position'] != 'none':
-                    click.echo(f"  QR Text: x={content_pos.qr_text_x_mm:.2f}mm, y={content_pos.qr_text_y_mm:.2f}mm", err=True)
-                    click.echo(f"  Barcode Text: x={content_pos.barcode_text_x_mm:.2f}mm, y={content_pos.barcode_text_y_mm:.2f}mm", err=True)
-            
-            # Draw QR code
-            self._draw_image(qr_img, content_pos.qr_x_mm, content_pos.qr_y_mm, 
-                           self.qr_gen.size_mm, self.qr_gen.size_mm)
-            
-            # Draw barcode
-            barcode_height_mm = self.barcode_gen.height_mm
-            self._draw_image(barcode_img, content_pos.barcode_x_mm, content_pos.barcode_y_mm,
-                           barcode_width_mm, barcode_height_mm)
-            
-            # Draw text if enabled
-            if text_config['position'] != 'none':
-                # Draw text for QR code (centered under/over QR)
-                self._draw_text(entry.qr_value, content_pos.qr_text_x_mm, content_pos.qr_text_y_mm, alignment='center')
-                # Draw text for barcode (centered under/over barcode)
-                self._draw_text(entry.barcode_value, content_pos.barcode_text_x_mm, content_pos.barcode_text_y_mm, alignment='center')
-            
-            successful += 1
+            for index in range(page_start, page_end):
+                entry_id, qr_value, barcode_value = ids[index], qr_values[index], barcode_values[index]
+                if not valid[index]:
+                    skipped += 1
+                    continue
+                barcode_img = barcode_images[barcode_value]
+                
+                # Check pre-generated QR code
+                qr_img = qr_images[qr_value]
+                if qr_img is None:
+                    click.echo(f"Warning: Failed to generate QR for ID: {entry_id}", err=True)
+                    skipped += 1
+                    continue
+                
+                # Save debug QR image
+                if self.debug:
+                    qr_debug_path = f"{self._debug_prefix}qr_{entry_id}_{index}.png"
+                    qr_img.save(qr_debug_path)
+                    click.echo(f"Debug: Saved QR image to {qr_debug_path} (size: {qr_img.size})", err=True)
+                
+                # Check pre-generated barcode
+                if barcode_img is None:
+                    click.echo(f"Warning: Failed to generate barcode for ID: {entry_id}", err=True)
+                    skipped += 1
+                    continue
+                
+                # Save debug barcode image
+                if self.debug:
+                    barcode_debug_path = f"{self._debug_prefix}barcode_{entry_id}_{index}.png"
+                    barcode_img.save(barcode_debug_path)
+                    click.echo(f"Debug: Saved barcode image to {barcode_debug_path} (size: {barcode_img.size})", err=True)
+                
+                # Get label position
+                label_pos = label_positions[index]
+                
+                # Calculate barcode width in mm
+                # (the generator declares the image's print resolution)
+                barcode_width_pixels = barcode_img.size[0]
+                barcode_dpi = barcode_img.info.get('dpi', (self.dpi, self.dpi))[0]
+                barcode_width_mm = (barcode_width_pixels / barcode_dpi) * 25.4
+                
+                # Get content positions
+                content_pos = self.layout_engine.get_content_position(label_pos, barcode_width_mm)
+                
+                # Debug output for positions
+                if self.debug:
+                    click.echo(f"Debug: Label {index} ({entry_id}) positions:", err=True)
+                    click.echo(f"  Label: x={label_pos.x_mm:.2f}mm, y={label_pos.y_mm:.2f}mm", err=True)
+                    click.echo(f"  QR: x={content_pos.qr_x_mm:.2f}mm, y={content_pos.qr_y_mm:.2f}mm, size={qr_size_mm}mm", err=True)
+                    click.echo(f"  Barcode: x={content_pos.barcode_x_mm:.2f}mm, y={content_pos.barcode_y_mm:.2f}mm, w={barcode_width_mm:.2f}mm, h={barcode_height_mm}mm", err=True)
+                    if text_enabled:
+                        click.echo(f"  QR Text: x={content_pos.qr_text_x_mm:.2f}mm, y={content_pos.qr_text_y_mm:.2f}mm", err=True)
+                        click.echo(f"  Barcode Text: x={content_pos.barcode_text_x_mm:.2f}mm, y={content_pos.barcode_text_y_mm:.2f}mm", err=True)
+                
+                # Draw QR code
+                self._draw_image(qr_img, content_pos.qr_x_mm, content_pos.qr_y_mm, 
+                               qr_size_mm, qr_size_mm)
+                
+                # Draw barcode
+                self._draw_image(barcode_img, content_pos.barcode_x_mm, content_pos.barcode_y_mm,
+                               barcode_width_mm, barcode_height_mm)
+                
+                # Draw text if enabled
+                if text_enabled:
+                    # Draw text for QR code (centered under/over QR)
+                    self._draw_text(qr_value, content_pos.qr_text_x_mm, content_pos.qr_text_y_mm, alignment='center')
+                    # Draw text for barcode (centered under/over barcode)
+                    self._draw_text(barcode_value, content_pos.barcode_text_x_mm, content_pos.barcode_text_y_mm, alignment='center')
+                
+                successful += 1
         
         # Finalize PDF
         if self.canvas: